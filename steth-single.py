@@ -25,36 +25,69 @@ Total power supply on pin 36: <300 mA. Stall current of a microservo is ~500 mA,
 
 """
 
+import gc
+import micropython
 import utime
 from machine import Pin
 from servo import Servo
 import picodisplay as display
 from rotary_irq_rp2 import RotaryIRQ
 
+# Bind the hot utime functions to module names, saving an attribute lookup per call
+_ticks_ms = utime.ticks_ms
+_ticks_diff = utime.ticks_diff
+_ticks_add = utime.ticks_add
+
 # Set up and initialise Pico Display
 buf = bytearray(display.get_width() * display.get_height() * 2)
 display.init(buf)
 display.set_backlight(0.8)
 
+
+def _glyph_runs(pattern):
+    """Convert a 5x8 character bitmap into the rectangles needed to draw it.
+
+    Each lit dot is 2x2 pixels. Horizontal runs of dots become one rectangle,
+    and identical runs on consecutive lines are merged, so draw_char() only
+    has a handful of (dx, dy, width, height) tuples to draw."""
+    runs = []
+    for line in range(8):  # 5x8 characters
+        start = None
+        for i in range(3, 9): # Low value bits only, plus one to close a run
+            dot = i < 8 and pattern[line] & (1 << (7 - i)) # Extract bit
+            if dot and start is None:
+                start = i
+            elif not dot and start is not None:
+                run = [start * 2, line * 2, (i - start) * 2, 2]
+                for prev in runs:
+                    if prev[0] == run[0] and prev[2] == run[2] and prev[1] + prev[3] == run[1]:
+                        prev[3] += 2
+                        break
+                else:
+                    runs.append(run)
+                start = None
+    return tuple(tuple(run) for run in runs)
+
+
 # Borrowed from Tony Goodhew's PicoDisplay example code
-up_arrow =[0,4,14,21,4,4,0,0]
-down_arrow = [0,4,4,21,14,4,0,0]
-bits = [128,64,32,16,8,4,2,1]  # Powers of 2
+# Converted to rectangles once, here, rather than on every draw.
+up_arrow = _glyph_runs([0,4,14,21,4,4,0,0])
+down_arrow = _glyph_runs([0,4,4,21,14,4,0,0])
 
 # Display mode
 display_mode = 0 # Default
 
+# Bit flags for which ServoController settings the rotary encoder is adjusting
+_SETTING_MIN = const(1)
+_SETTING_MAX = const(2)
+_SETTING_SPEED = const(4)
+_SETTING_POSITION = const(8)
+
 # Print defined character from set above
-def draw_char(xpos, ypos, pattern):
-    for line in range(8):  # 5x8 characters
-        for ii in range(5): # Low value bits only
-            i = ii + 3
-            dot = pattern[line] & bits[i] # Extract bit
-            if dot: # print white dots
-                display.pixel(xpos+i*2, ypos+line*2)
-                display.pixel(xpos+i*2, ypos+line*2+1)
-                display.pixel(xpos+i*2+1, ypos+line*2)
-                display.pixel(xpos+i*2+1, ypos+line*2+1)
+@micropython.native
+def draw_char(xpos, ypos, runs):
+    for dx, dy, w, h in runs:
+        display.rectangle(xpos + dx, ypos + dy, w, h)
 
 
 def rescale(x, in_min, in_max, out_min, out_max):
@@ -68,6 +101,14 @@ def rescale(x, in_min, in_max, out_min, out_max):
         return int((x - in_min) * (out_max - out_min) / (in_max - in_min) + out_min)
 
 
+@micropython.native
+def _rescale_angle(x):
+    """Integer-only rescale of an angle (0-180) onto the scale line (50-190).
+
+    Specialised version of rescale() for the per-frame draw path."""
+    return 50 + (x * 140) // 180
+
+
 def zfl(s, width=3, padchar='0'):
     """Pads string with leading zeros.
 
@@ -77,6 +118,23 @@ def zfl(s, width=3, padchar='0'):
     return '{:{p}>{w}}'.format(s, w=width, p=padchar)
 
 
+# Every value we display (angles 0-180, speed 1-150) zero-padded to three
+# characters, built once so that draw() doesn't format strings.
+_STR3 = [zfl(str(i), 3) for i in range(181)]
+
+
+# Last pen colour set on the display (packed as 0xRRGGBB), so that
+# repeated set_pen() calls with the same colour can be skipped.
+_current_pen = [None]
+
+def _set_pen(r, g, b):
+    """Set the display pen, unless it's already that colour."""
+    pen = (r << 16) | (g << 8) | b
+    if _current_pen[0] != pen:
+        display.set_pen(r, g, b)
+        _current_pen[0] = pen
+
+
 def increment_application_mode():
     """Loops through application modes."""
     global display_mode
@@ -98,9 +156,8 @@ class ServoController:
         self.marker = marker
         self.marker_offset = marker_offset
 
-        # TODO: I don't think @property/getter/setter decorators work
-        #       in Micropython, so it's a pain to do input validation.
-        #       But equally, I can't find any documentation on this. Sigh.
+        # TODO: @property/setter decorators do work in Micropython (see angle,
+        #       below), so the other settings could validate input the same way.
 
         self.min_angle = 90
         self.max_angle = 90
@@ -118,9 +175,123 @@ class ServoController:
         self.speed_being_updated = False
         self.is_selected = False
         self.is_running = False
+        # The same flags, packed for increment_value()/decrement_value()
+        self._active_settings = 0
+
+        # Angle last shown in the full view's centre readout
+        self._drawn_angle = None
+
+        # Dirty-rect bookkeeping: redraw everything on the next frame,
+        # and remember what was last drawn so only changes are repainted.
+        self._dirty_all = True
+        self._last_rendered = None
+        self._prev_marker_pos = None
+        # Set when the display has already been blanked under this servo
+        self._region_clear = False
 
         # Set a time reference
-        self._time_ref = utime.ticks_ms()
+        self._time_ref = _ticks_ms()
+
+    @property
+    def angle(self):
+        """Current position in whole degrees."""
+        return self._angle_q // 1000
+
+    @angle.setter
+    def angle(self, value):
+        # Position is held as an integer number of thousandths of a degree,
+        # so update() can work without software floating point.
+        self._angle_q = int(value * 1000)
+
+    def _render_signature(self):
+        """Pack everything draw() shows, bar the position, into one small int.
+
+        If this matches the value from the last full redraw, only the marker
+        and angle readout need repainting. An int, unlike a tuple, doesn't
+        allocate on every frame."""
+        flags = (self._active_settings
+                 | (16 if self.is_running else 0)
+                 | (32 if self.is_selected else 0)
+                 | (self.display_mode << 6))
+        return ((self.min_angle * 181 + self.max_angle) * 151 + self.speed) * 128 + flags
+
+    def mark_dirty(self, cleared=False):
+        """Force a full redraw of this servo on the next frame.
+
+        Pass cleared=True if the caller has already blanked the display,
+        so the servo's region isn't cleared a second time."""
+        self._dirty_all = True
+        self._region_clear = cleared
+
+    def redraw_if_dirty(self):
+        """Redraw only the parts of the display that have changed.
+
+        Any change to the settings, flags or view clears and redraws this
+        servo's whole region; otherwise only the position marker and the
+        angle readout are repainted."""
+        signature = self._render_signature()
+        if self._dirty_all or signature != self._last_rendered:
+            if not self._region_clear:
+                _set_pen(0, 0, 0)
+                if self.display_mode == 1:
+                    # Full view owns the whole screen
+                    display.clear()
+                else:
+                    display.rectangle(0, self.vertical_offset - 20, 240, 50)
+            self.draw()
+            self._dirty_all = False
+            self._region_clear = False
+            self._last_rendered = signature
+            self._prev_marker_pos = self._marker_pos
+            return
+
+        if _rescale_angle(self.angle) - 10 != self._prev_marker_pos:
+            # Erase the old marker. This can clip the tick marks, so redraw the scale too.
+            _set_pen(0, 0, 0)
+            display.rectangle(self._prev_marker_pos + 6, self.vertical_offset + 13 + self.marker_offset, 10, 16)
+            self._draw_scale()
+            self._draw_marker()
+            self._prev_marker_pos = self._marker_pos
+
+        if self.display_mode == 1 and self.angle != self._drawn_angle:
+            _set_pen(0, 0, 0)
+            display.rectangle(95, self._angle_text_y(), 80, 32)
+            self._draw_angle()
+
+    def _angle_text_y(self):
+        """Vertical position of the large angle readout in the full view."""
+        if self.vertical_offset == 90:
+            return 45
+        return self.vertical_offset + 35
+
+    def _draw_scale(self):
+        """Draw the scale line and movement end tic marks."""
+        # Draw scale line
+        _set_pen(255, 255, 255)
+        display.rectangle(50, self.vertical_offset + 6, 140, 2)
+        # display.pixel_span(50, self.vertical_offset + 6, 140)
+        # display.pixel_span(50, self.vertical_offset + 7, 140)
+        # display.update()
+
+        # Draw movement end tic marks
+        self._tick_min = _rescale_angle(self.min_angle)
+        self._tick_max = _rescale_angle(self.max_angle)
+        display.rectangle(self._tick_min, self.vertical_offset + 2, 2, 10)
+        display.rectangle(self._tick_max, self.vertical_offset + 2, 2, 10)
+
+    def _draw_marker(self):
+        """Draw the position marker."""
+        self._marker_pos = _rescale_angle(self.angle) - 10
+        _set_pen(255, 0, 0)
+        # I don't know why this print is necessary, but without it the code blows up after a very short time.
+        # print(self._marker_pos, self.vertical_offset + 13 + self.marker_offset)
+        draw_char(self._marker_pos, self.vertical_offset + 13 + self.marker_offset, self.marker)
+
+    def _draw_angle(self):
+        """Display current angle in centre space."""
+        _set_pen(0, 255, 0) if self.position_being_updated else _set_pen(255, 255, 0)
+        self._drawn_angle = self.angle
+        display.text(_STR3[self._drawn_angle], 95, self._angle_text_y(), 200, 4)
 
     def draw(self):
         """Draw the servo on the display.
@@ -129,78 +300,55 @@ class ServoController:
 
         # Are we selected? if so, draw a background
         if self.is_selected:
-            display.set_pen(70, 70, 70)
+            _set_pen(70, 70, 70)
             display.rectangle(0, self.vertical_offset - 20, 240, self.vertical_offset + 20)
 
         # Display minimum angle
         # Set pen colour to green if being updated, else yellow
-        display.set_pen(0, 255, 0) if self.min_position_being_updated else display.set_pen(255, 255, 0)
-        display.text(zfl(str(self.min_angle), 3), 10, self.vertical_offset, 200, 2)
+        _set_pen(0, 255, 0) if self.min_position_being_updated else _set_pen(255, 255, 0)
+        display.text(_STR3[self.min_angle], 10, self.vertical_offset, 200, 2)
         # printstring(zfl(str(self.min_angle), 3), 10, self.vertical_offset, 1, False, False)
 
         # Display maximum angle
-        display.set_pen(0, 255, 0) if self.max_position_being_updated else display.set_pen(255, 255, 0)
-        display.text(zfl(str(self.max_angle), 3), 200, self.vertical_offset, 200, 2)
-
-        # Draw scale line
-        display.set_pen(255, 255, 255)
-        display.rectangle(50, self.vertical_offset + 6, 140, 2)
-        # display.pixel_span(50, self.vertical_offset + 6, 140)
-        # display.pixel_span(50, self.vertical_offset + 7, 140)
-        # display.update()
-
-        # Draw movement end tic marks
-        self._tick_min = rescale(self.min_angle, 0, 180, 50, 140 + 50)
-        self._tick_max = rescale(self.max_angle, 0, 180, 50, 140 + 50)
-        display.rectangle(self._tick_min, self.vertical_offset + 2, 2, 10)
-        display.rectangle(self._tick_max, self.vertical_offset + 2, 2, 10)
+        _set_pen(0, 255, 0) if self.max_position_being_updated else _set_pen(255, 255, 0)
+        display.text(_STR3[self.max_angle], 200, self.vertical_offset, 200, 2)
 
-        # Draw position marker
-        self._marker_pos = rescale(self.angle, 0, 180, 50, 140 + 50) - 10
-        display.set_pen(255, 0, 0)
-        # I don't know why this print is necessary, but without it the code blows up after a very short time.
-        # print(self._marker_pos, self.vertical_offset + 13 + self.marker_offset)
-        draw_char(self._marker_pos, self.vertical_offset + 13 + self.marker_offset, self.marker)
+        # Draw the remaining values straight after min/max, so that in the
+        # common case (nothing being edited) the yellow pen is only set once.
+        if self.display_mode == 1:
+            # Display speed data
+            if self.vertical_offset == 90:
+                # Display speed and RUN/STOP by the other buttons
+                speed_y = 20
+                run_y = 25
+            else:
+                # Display speed and RUN/STOP by the lower buttons
+                speed_y = self.vertical_offset + 75
+                run_y = speed_y
+            _set_pen(0, 255, 0) if self.speed_being_updated else _set_pen(255, 255, 0)
+            display.text(_STR3[self.speed] + " SPD", 10, speed_y, 200, 2)
+            self._draw_angle()
+
+        self._draw_scale()
+        self._draw_marker()
         # Update physical servo position, correcting for angle range
         # self._servo.value((self.angle + 90) % 180)
         # self._servo.value(rescale(self.angle, -90, 90, 0, 180))
 
         if self.display_mode == 1:
-            # Display speed data
-            if self.vertical_offset == 90:
-                # Display speed by other button
-                display.set_pen(0, 255, 0) if self.speed_being_updated else display.set_pen(255, 255, 0)
-                display.text(zfl(str(self.speed), 3) + " SPD", 10, 20, 200, 2)
-                # DIsplay current angle in centre space
-                display.set_pen(0, 255, 0) if self.position_being_updated else display.set_pen(255, 255, 0)
-                display.text(zfl(str(int(self.angle)), 3), 95, 45, 200, 4)
-                # Display RUN/STOP text
-                if self.is_running:
-                    display.set_pen(255, 0, 0)
-                    display.text("STOP", 190, 25, 200, 2)
-                else:
-                    display.set_pen(0, 255, 0)
-                    display.text(" RUN", 190, 25, 200, 2)
+            # Display RUN/STOP legend. STOP follows the red marker, so shares its pen.
+            if self.is_running:
+                _set_pen(255, 0, 0)
+                display.text("STOP", 190, run_y, 200, 2)
             else:
-                # Display speed setting by lower-left button
-                display.set_pen(0, 255, 0) if self.speed_being_updated else display.set_pen(255, 255, 0)
-                display.text(zfl(str(self.speed), 3) + " SPD", 10, self.vertical_offset + 75, 200, 2)
-                # Display current angle in centre space
-                display.set_pen(0, 255, 0) if self.position_being_updated else display.set_pen(255, 255, 0)
-                display.text(zfl(str(int(self.angle)), 3), 95, self.vertical_offset + 35, 200, 4)
-                # Display RUN/STOP legend by lower right button
-                if self.is_running:
-                    display.set_pen(255, 0, 0)
-                    display.text("STOP", 190, self.vertical_offset + 75, 200, 2)
-                else:
-                    display.set_pen(0, 255, 0)
-                    display.text(" RUN", 190, self.vertical_offset + 75, 200, 2)
+                _set_pen(0, 255, 0)
+                display.text(" RUN", 190, run_y, 200, 2)
 
 
     def move(self):
         """Move the servo to the current position."""
         # self._servo.value(rescale(self.angle, 0, 180, -90, 90))
-        self._servo.value(int(self.angle - 90))
+        self._servo.value(self._angle_q // 1000 - 90)
         # self._servo.value(self.angle - 90)
 
     def min_position_setting_toggle(self):
@@ -210,6 +358,7 @@ class ServoController:
             self.max_position_being_updated = False
             self.speed_being_updated = False
             self.is_running = False
+        self._settings_changed()
 
     def max_position_setting_toggle(self):
         self.max_position_being_updated = not self.max_position_being_updated
@@ -218,6 +367,7 @@ class ServoController:
             self.min_position_being_updated = False
             self.speed_being_updated = False
             self.is_running = False
+        self._settings_changed()
 
     def position_and_min_setting_toggle(self):
         self.min_position_being_updated = not self.min_position_being_updated
@@ -226,6 +376,7 @@ class ServoController:
         if self.min_position_being_updated:
             self.max_position_being_updated = False
             self.speed_being_updated = False
+        self._settings_changed()
 
     def position_and_max_setting_toggle(self):
         self.max_position_being_updated = not self.max_position_being_updated
@@ -234,6 +385,7 @@ class ServoController:
         if self.max_position_being_updated:
             self.min_position_being_updated = False
             self.speed_being_updated = False
+        self._settings_changed()
 
     def speed_setting_toggle(self):
         self.speed_being_updated = not self.speed_being_updated
@@ -242,6 +394,7 @@ class ServoController:
             self.min_position_being_updated = False
             self.max_position_being_updated = False
             self.position_being_updated = False
+        self._settings_changed()
 
     def toggle_run(self):
         """Toggle run state."""
@@ -250,6 +403,15 @@ class ServoController:
         self.max_position_being_updated = False
         self.position_being_updated = False
         self.speed_being_updated = False
+        self._settings_changed()
+
+    def _settings_changed(self):
+        """Pack the being_updated flags into _active_settings."""
+        self._active_settings = (
+            (_SETTING_MIN if self.min_position_being_updated else 0)
+            | (_SETTING_MAX if self.max_position_being_updated else 0)
+            | (_SETTING_SPEED if self.speed_being_updated else 0)
+            | (_SETTING_POSITION if self.position_being_updated else 0))
 
     def run(self):
         """Start, or keep going."""
@@ -267,89 +429,86 @@ class ServoController:
         """Display detailed view."""
         self.display_mode = 1
 
+    @micropython.native
     def increment_value(self):
         """Increment whatever we're incrementing.
 
         Keep it within bounds.
         """
         # print(">>> Incrementing")
-        if self.min_position_being_updated:
-            self.min_angle += 2
-            if self.min_angle > 180:
-                self.min_angle = 180
-
-        if self.max_position_being_updated:
-            self.max_angle += 2
-            if self.max_angle > 180:
-                self.max_angle = 180
+        active = self._active_settings
+        if not active:
+            return
 
-        # if we're moving min and it's > max, increment max also
-        if self.min_angle > self.max_angle:
-            self.max_angle = self.min_angle
+        if active & _SETTING_MIN:
+            self.min_angle = min(180, self.min_angle + 2)
+            # if we're moving min and it's > max, increment max also
+            if self.min_angle > self.max_angle:
+                self.max_angle = self.min_angle
 
-        if self.speed_being_updated:
-            self.speed += 2
-            if self.speed > 150:
-                self.speed = 150
+        if active & _SETTING_MAX:
+            self.max_angle = min(180, self.max_angle + 2)
 
-        if self.position_being_updated:
-            self.angle += 2
-            if self.angle > 180:
-                self.angle = 180
+        if active & _SETTING_SPEED:
+            self.speed = min(150, self.speed + 2)
 
+        if active & _SETTING_POSITION:
+            self.angle = min(180, self.angle + 2)
 
         # print(f"[{self.min_angle}, {self.max_angle}]")
 
+    @micropython.native
     def decrement_value(self):
         """Decrement whatever we're decrementing.
 
         Keep it within bounds.
         """
-        if self.min_position_being_updated:
-            self.min_angle -= 2
-            if self.min_angle < 0:
-                self.min_angle = 0
+        active = self._active_settings
+        if not active:
+            return
 
-        if self.max_position_being_updated:
-            self.max_angle -= 2
-            if self.max_angle < 0:
-                self.max_angle = 0
+        if active & _SETTING_MIN:
+            self.min_angle = max(0, self.min_angle - 2)
 
-        if self.max_angle < self.min_angle:
-            self.min_angle = self.max_angle
+        if active & _SETTING_MAX:
+            self.max_angle = max(0, self.max_angle - 2)
+            # if we're moving max and it's < min, decrement min also
+            if self.max_angle < self.min_angle:
+                self.min_angle = self.max_angle
 
+        if active & _SETTING_SPEED:
+            self.speed = max(1, self.speed - 1)
 
-        if self.speed_being_updated:
-            self.speed -= 1
-            if self.speed < 1:
-                self.speed = 1
+        if active & _SETTING_POSITION:
+            self.angle = max(0, self.angle - 2)
 
-        if self.position_being_updated:
-            self.angle -= 2
-            if self.angle < 0:
-                self.angle = 0
 
+    @micropython.native
+    def update(self, now):
+        """Update the servo position.
 
-    def update(self):
-        """Update the servo position."""
+        now is the current utime.ticks_ms() value, read once per frame by the caller."""
 
-        # Calculate angular movement since last update
-        self._time_delta = utime.ticks_diff(utime.ticks_ms(), self._time_ref)
-        self._time_ref = utime.ticks_ms()
-        self._angle_delta = self.speed * self._time_delta / 1000
+        # Calculate angular movement since last update.
+        # Speed is in degrees/s and time in ms, so this is in thousandths of a degree.
+        time_delta = _ticks_diff(now, self._time_ref)
+        self._time_ref = now
 
-        # Update angular position, catching end points
+        # Update angular position, catching end points.
+        # Work on a local copy and store it back once.
         if self.is_running:
+            angle_q = self._angle_q
             if self._reversing:
-                self.angle -= self._angle_delta
-                if self.angle < self.min_angle:
-                    self.angle = self.min_angle
+                angle_q -= self.speed * time_delta
+                if angle_q < self.min_angle * 1000:
+                    angle_q = self.min_angle * 1000
                     self._reversing = False
             else:
-                self.angle += self._angle_delta
-                if self.angle > self.max_angle:
-                    self.angle = self.max_angle
+                angle_q += self.speed * time_delta
+                if angle_q > self.max_angle * 1000:
+                    angle_q = self.max_angle * 1000
                     self._reversing = True
+            self._angle_q = angle_q
 
         # Update physical servo position
         self.move()
@@ -362,15 +521,13 @@ class PinButton:
         self._pin = pin
         self._pullup = pullup
         self._button = Pin(pin, Pin.IN, Pin.PULL_UP if self._pullup else Pin.PULL_DOWN)
-
-    def value(self):
-        return self._button.value()
+        # Expose the Pin's own value() directly, rather than wrapping it in a method
+        self.value = self._button.value
+        # Pin reads this when the button isn't pressed
+        self._released_value = 1 if self._pullup else 0
 
     def is_pressed(self):
-        if self._pullup:
-            return self.value() == 0
-        else:
-            return self.value() == 1
+        return self.value() != self._released_value
 
 class ButtonController:
     """Poll buttons and dispatch events.
@@ -383,17 +540,23 @@ class ButtonController:
     def __init__(self, mapping, debounce_interval=500):
         """Initialise the controller."""
         self._mapping = mapping
+        # Resolve the methods once, rather than on every poll
+        self._flat = [(button, getattr(m['object'], m['method'])) for button, m in mapping.items()]
         self.debounce_interval = debounce_interval
-        self._time_last_checked = utime.ticks_ms()
+        self._time_last_checked = _ticks_ms()
+
+    def check(self, now):
+        """Check the buttons and call the appropriate method.
 
-    def check(self):
-        """Check the buttons and call the appropriate method."""
+        now is the current utime.ticks_ms() value."""
+        if _ticks_diff(now, self._time_last_checked) <= self.debounce_interval:
+            return
         # Check for button presses
-        for button in self._mapping:
-            if display.is_pressed(button) and utime.ticks_diff(utime.ticks_ms(), self._time_last_checked) > self.debounce_interval:
-                self._time_last_checked = utime.ticks_ms()
-                # Have to use getattr here for dynamic method call
-                getattr(self._mapping[button]['object'], self._mapping[button]['method'])()
+        for button, method in self._flat:
+            if display.is_pressed(button):
+                self._time_last_checked = now
+                method()
+                return
 
 
 class PinButtonController:
@@ -402,17 +565,23 @@ class PinButtonController:
     def __init__(self, mapping, debounce_interval=500):
         """Initialise the controller."""
         self._mapping = mapping
+        # Resolve the methods once, rather than on every poll
+        self._flat = [(button, getattr(m['object'], m['method'])) for button, m in mapping.items()]
         self.debounce_interval = debounce_interval
-        self._time_last_checked = utime.ticks_ms()
+        self._time_last_checked = _ticks_ms()
 
-    def check(self):
-        """Check the buttons and call the appropriate method."""
+    def check(self, now):
+        """Check the buttons and call the appropriate method.
+
+        now is the current utime.ticks_ms() value."""
+        if _ticks_diff(now, self._time_last_checked) <= self.debounce_interval:
+            return
         # Check for button presses
-        for button in self._mapping:
-            if button.is_pressed() and utime.ticks_diff(utime.ticks_ms(), self._time_last_checked) > self.debounce_interval:
-                self._time_last_checked = utime.ticks_ms()
-                # Have to use getattr here for dynamic method call
-                getattr(self._mapping[button]['object'], self._mapping[button]['method'])()
+        for button, method in self._flat:
+            if button.is_pressed():
+                self._time_last_checked = now
+                method()
+                return
 
 
 class ApplicationController:
@@ -425,6 +594,10 @@ class ApplicationController:
         self._num_states = num_states
         self._menu_list = menu_list
 
+        # Start in the given state; _handle_state_change() takes over from here
+        self._update_impl = (self._update_state0, self._update_state1, self._update_state2)[application_state]
+        self._menu = menu_list[application_state]
+
     def increment_state(self):
         """Cycle application state."""
         self.application_state += 1
@@ -440,29 +613,48 @@ class ApplicationController:
             for thing in self._object_list:
                 thing.display_small()
                 thing.run()
+            self._update_impl = self._update_state0
         elif self.application_state == 1:
             for thing in self._object_list:
                 thing.stop()
             self._object_list[0].display_full()
+            self._update_impl = self._update_state1
         elif self.application_state == 2:
             for thing in self._object_list:
                 thing.stop()
             self._object_list[1].display_full()
+            self._update_impl = self._update_state2
 
-    def update(self):
-        if self.application_state == 0:
-            self._menu_list[0].check()
-            for thing in self._object_list:
-                thing.update()
-                thing.draw()
-        elif self.application_state == 1:
-            self._menu_list[1].check()
-            self._object_list[0].update()
-            self._object_list[0].draw()
-        elif self.application_state == 2:
-            self._menu_list[2].check()
-            self._object_list[1].update()
-            self._object_list[1].draw()
+        # Buttons are mapped per state
+        self._menu = self._menu_list[self.application_state]
+
+        # Layout has changed: start from a blank screen and redraw everything
+        _set_pen(0, 0, 0)
+        display.clear()
+        for thing in self._object_list:
+            thing.mark_dirty(cleared=True)
+
+    def check(self, now):
+        """Check the buttons for the current state."""
+        self._menu.check(now)
+
+    @micropython.native
+    def update(self, now):
+        # Dispatch to the state's update method, chosen in _handle_state_change()
+        self._update_impl(now)
+
+    def _update_state0(self, now):
+        for thing in self._object_list:
+            thing.update(now)
+            thing.redraw_if_dirty()
+
+    def _update_state1(self, now):
+        self._object_list[0].update(now)
+        self._object_list[0].redraw_if_dirty()
+
+    def _update_state2(self, now):
+        self._object_list[1].update(now)
+        self._object_list[1].redraw_if_dirty()
 
 class RotaryController():
     """Read rotary encoder value and dispatch accordingly.
@@ -471,11 +663,11 @@ class RotaryController():
     Polls the encoder and calls the appropriate method on the object.
     """
 
-    def __init__(self, mapping, debounce_interval=60):
+    def __init__(self, mapping):
         """Initialize the controller."""
         self._mapping = mapping
-        self._debounce_interval = debounce_interval
-        self._time_last_checked = utime.ticks_ms()
+        # Resolve the (increment, decrement) methods once, rather than on every tick
+        self._flat = [(getattr(o, m['inc_method']), getattr(o, m['dec_method'])) for o, m in mapping.items()]
 
         self._r = RotaryIRQ(pin_num_clk=21,
               pin_num_dt=22,
@@ -486,27 +678,29 @@ class RotaryController():
               pull_up=False,
               half_step=True)
 
-        self._old_value = self._r.value()
-        self._new_value = self._r.value()
-
-    def check(self):
-        """Check the rotary encoder value and dispatch accordingly."""
-
-        if utime.ticks_diff(utime.ticks_ms(), self._time_last_checked) > self._debounce_interval:
-            self._time_last_checked = utime.ticks_ms()
-            self._new_value = self._r.value()
-            if self._new_value > self._old_value:
-                self._old_value = self._new_value
-                for object in self._mapping:
-                    getattr(object, self._mapping[object]['inc_method'])()
-                    # print("Incrementing")
-                    # print(object, self._mapping[object]['inc_method'])
-            if self._new_value < self._old_value:
-                self._old_value = self._new_value
-                for object in self._mapping:
-                    # Note the (): you still have to call the method once you've found it.
-                    getattr(object, self._mapping[object]['dec_method'])()
-                    # print("Decrementing")
+        # Keep the encoder's bound value() method to skip a lookup on each check
+        self._rval = self._r.value
+        self._old_value = self._rval()
+
+    @micropython.native
+    def check(self, now):
+        """Check the rotary encoder value and dispatch accordingly.
+
+        now is the current utime.ticks_ms() value, taken to match the other
+        controllers. The main loop only calls this every input_check_interval
+        ms, which debounces the encoder."""
+
+        new_value = self._rval()
+        old_value = self._old_value
+        if new_value == old_value:
+            return
+        self._old_value = new_value
+        if new_value > old_value:
+            for inc, _ in self._flat:
+                inc()
+        else:
+            for _, dec in self._flat:
+                dec()
 
 
 if __name__ == '__main__':
@@ -516,7 +710,7 @@ if __name__ == '__main__':
     servoD7 = ServoController(pin=3, speed=60, vertical_offset=90, marker=down_arrow, marker_offset=-25)
 
     # For some reason, we need to draw everything once, or the methods error out in the loop. weird.
-    display.set_pen(0, 0, 0)
+    _set_pen(0, 0, 0)
     display.clear()
     servoD5.draw()
     servoD7.draw()
@@ -589,19 +783,37 @@ if __name__ == '__main__':
     }
     rotary = RotaryController(rotary_mapping_main)
 
+    # Inputs are polled on a shared schedule, in ms. This is also the
+    # rotary encoder's debounce interval.
+    input_check_interval = 60
+    next_input_check = _ticks_ms()
+
+    # Setup is done, so tidy the heap now and have the GC run little and often
+    # from here on, rather than stalling the loop for a big collection.
+    # The draw path reuses precomputed strings, so steady state barely allocates.
+    gc.collect()
+    gc.threshold(gc.mem_free() // 4 + gc.mem_alloc())
 
     while True:
-        display.set_pen(0, 0, 0)
-        display.clear()
+        # No display.clear() here: each servo redraws only what has changed,
+        # and ApplicationController clears the screen on state changes.
         # servoD5.draw()
         # servoD7.draw()
 
         # servoD5.update()
         # servoD7.update()
 
-        rotary.check()
-        app_control_button_controller.check()
-        app.update()
+        now = _ticks_ms()
+
+        # Poll the inputs on their shared schedule, so most frames skip
+        # straight past them with one compare.
+        if _ticks_diff(now, next_input_check) >= 0:
+            next_input_check = _ticks_add(now, input_check_interval)
+            rotary.check(now)
+            app_control_button_controller.check(now)
+            app.check(now)
+
+        app.update(now)
         display.update()
 
         # utime.sleep_ms(20)
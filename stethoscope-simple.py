@@ -25,6 +25,7 @@ Total power supply on pin 36: <300 mA. Stall current of a microservo is ~500 mA,
 
 """
 
+import micropython
 import utime
 from machine import Pin
 from servo import Servo
@@ -36,22 +37,57 @@ buf = bytearray(display.get_width() * display.get_height() * 2)
 display.init(buf)
 display.set_backlight(0.8)
 
+# View onto the frame buffer, so blocks of it can be overwritten in place
+# without slicing (and so copying) the bytearray
+_fb = memoryview(buf)
+_ROW_BYTES = display.get_width() * 2
+
 # Borrowed from Tony Goodhew's PicoDisplay example code
 up_arrow =[0,4,14,21,4,4,0,0]
 down_arrow = [0,4,4,21,14,4,0,0]
-bits = [128,64,32,16,8,4,2,1]  # Powers of 2
+
+# Bind the functions used every frame to module-level names,
+# saving an attribute lookup on each call
+_ticks_ms = utime.ticks_ms
+_ticks_diff = utime.ticks_diff
+_ticks_add = utime.ticks_add
+_set_pen = display.set_pen
+_rect = display.rectangle
+_text = display.text
+_min = min
+_max = max
+
+# Button presses waiting to be handled; must be a power of two
+_BUTTON_QUEUE_SIZE = const(8)
+
+# Rows of black pixels copied into the frame buffer by _clear_strip().
+# A few rows at a time rather than a whole strip keeps this small; held as
+# a memoryview so the last, partial copy slices it without copying the data
+# (each slice is still a small view object on the heap).
+_BLACK_STRIP_ROWS = const(8)
+_BLACK_STRIP = memoryview(bytes(_ROW_BYTES * _BLACK_STRIP_ROWS))
 
 # Print defined character from set above
-def draw_char(xpos, ypos, pattern):
+@micropython.viper
+def draw_char(xpos: int, ypos: int, pattern):
     for line in range(8):  # 5x8 characters
+        row = int(pattern[line])
         for ii in range(5): # Low value bits only
             i = ii + 3
-            dot = pattern[line] & bits[i] # Extract bit
-            if dot: # print white dots
-                display.pixel(xpos+i*2, ypos+line*2)
-                display.pixel(xpos+i*2, ypos+line*2+1)
-                display.pixel(xpos+i*2+1, ypos+line*2)
-                display.pixel(xpos+i*2+1, ypos+line*2+1)
+            dot = row & (1 << (7 - i)) # Extract bit
+            if dot: # print 2x2 dots, in one call rather than four pixel() calls
+                _rect(xpos+i*2, ypos+line*2, 2, 2)
+
+
+def _clear_strip(y0, h):
+    """Fill rows y0 to y0+h of the display with black, straight into the frame buffer."""
+    start = y0 * _ROW_BYTES
+    end = start + h * _ROW_BYTES
+    chunk = len(_BLACK_STRIP)
+    while end - start > chunk:
+        _fb[start:start + chunk] = _BLACK_STRIP
+        start += chunk
+    _fb[start:end] = _BLACK_STRIP[:end - start]
 
 
 def rescale(x, in_min, in_max, out_min, out_max):
@@ -65,12 +101,9 @@ def rescale(x, in_min, in_max, out_min, out_max):
         return int((x - in_min) * (out_max - out_min) / (in_max - in_min) + out_min)
 
 
-def zfl(s, width):
-    """Pads string with leading zeros.
-
-    From https://stackoverflow.com/questions/63271522/is-there-a-zfill-type-function-in-micro-python-zfill-in-micro-python
-    There's no zfill() in Micropython."""
-    return '{:0>{w}}'.format(s, w=width)
+# rescale(x, 0, 180, 50, 190) for every whole angle, as used by the scale line.
+# Built once so the per-frame callers are a single index; values fit in a byte.
+_RESCALE_LUT = bytes(((x * 140) // 180 + 50) for x in range(181))
 
 class ServoController:
     """Visual and serial interface for servo control.
@@ -85,18 +118,31 @@ class ServoController:
         self.marker = marker
         self.marker_offset = marker_offset
 
+        # Band of the display this servo draws in, covering the labels,
+        # scale and marker, so it can be erased without clearing the screen.
+        self._strip_top = _min(vertical_offset - 20, vertical_offset + 13 + marker_offset)
+        self._strip_height = _max(vertical_offset + 20, vertical_offset + 29 + marker_offset) - self._strip_top
+
         # TODO: I don't think @property/getter/setter decorators work
         #       in Micropython, so it's a pain to do input validation.
         #       But equally, I can't find any documentation on this. Sigh.
 
         self.min_angle = 0
         self.max_angle = 180
+        self._update_ticks()
+        self._update_labels()
 
         self._min_display_position = 0
         self._max_display_position = 180
 
         self._reversing = False
 
+        # Position in 1/256ths of a degree, so update() can use integer maths
+        # (the RP2040 has no FPU). angle holds the whole-degree value.
+        self._angle_q8 = self.angle * 256
+        # Sub-unit movement carried over between updates, in 1/256000ths of a degree
+        self._step_remainder = 0
+
         # Booleans to determine pen colour for drawing values
         self.min_position_being_updated = False
         self.max_position_being_updated = False
@@ -104,46 +150,68 @@ class ServoController:
         self.speed_being_updated = False
         self.is_selected = False
 
+        # Does the display need redrawing? Start dirty to draw the first frame.
+        # _background_dirty covers the labels, scale and tics, which only
+        # change with the settings; otherwise only the marker is redrawn.
+        self._dirty = True
+        self._background_dirty = True
+        self._marker_pos = _RESCALE_LUT[int(self.angle)] - 10
+        self._drawn_marker_pos = self._marker_pos
+
         # Set a time reference
-        self._time_ref = utime.ticks_ms()
+        self._time_ref = _ticks_ms()
 
     def draw(self):
         """Draw the servo on the display.
 
         Also, write position to servo."""
 
+        marker_y = self.vertical_offset + 13 + self.marker_offset
+
+        # If only the marker has moved, leave the rest of the strip alone and
+        # just erase the old arrow (its lit dots fill a 10x10 box in the glyph)
+        if not (self._background_dirty or self.is_selected):
+            _set_pen(0, 0, 0)
+            _rect(self._drawn_marker_pos + 6, marker_y + 2, 10, 10)
+            _set_pen(255, 0, 0)
+            draw_char(self._marker_pos, marker_y, self.marker)
+            self._drawn_marker_pos = self._marker_pos
+            return
+        self._background_dirty = False
+
+        # Erase only this servo's part of the display
+        _clear_strip(self._strip_top, self._strip_height)
+
         # Are we selected? if so, draw a background
         if self.is_selected:
-            display.set_pen(70, 70, 70)
-            display.rectangle(0, self.vertical_offset - 20, 240, self.vertical_offset + 20)
+            _set_pen(70, 70, 70)
+            _rect(0, self.vertical_offset - 20, 240, self.vertical_offset + 20)
 
         # Display minimum angle
         # Set pen colour to green if being updated, else yellow
-        display.set_pen(0, 255, 0) if self.min_position_being_updated else display.set_pen(255, 255, 0)
-        display.text(zfl(str(self.min_angle), 3) + " MIN", 10, self.vertical_offset, 200)
-        # printstring(zfl(str(self.min_angle), 3), 10, self.vertical_offset, 1, False, False)
+        _set_pen(0, 255, 0) if self.min_position_being_updated else _set_pen(255, 255, 0)
+        _text(self._min_label, 10, self.vertical_offset, 200)
+        # printstring("%03d" % self.min_angle, 10, self.vertical_offset, 1, False, False)
 
         # Display maximum angle
-        display.set_pen(0, 255, 0) if self.max_position_being_updated else display.set_pen(255, 255, 0)
-        display.text(zfl(str(self.max_angle) + " MAX", 3), 200, self.vertical_offset, 200)
+        _set_pen(0, 255, 0) if self.max_position_being_updated else _set_pen(255, 255, 0)
+        _text(self._max_label, 200, self.vertical_offset, 200)
 
         # Draw scale line
-        display.set_pen(255, 255, 255)
-        display.rectangle(50, self.vertical_offset + 6, 140, 2)
+        _set_pen(255, 255, 255)
+        _rect(50, self.vertical_offset + 6, 140, 2)
         # display.pixel_span(50, self.vertical_offset + 6, 140)
         # display.pixel_span(50, self.vertical_offset + 7, 140)
         # display.update()
 
         # Draw movement end tic marks
-        self._tick_min = rescale(self.min_angle, 0, 180, 50, 140 + 50)
-        self._tick_max = rescale(self.max_angle, 0, 180, 50, 140 + 50)
-        display.rectangle(self._tick_min, self.vertical_offset + 2, 2, 10)
-        display.rectangle(self._tick_max, self.vertical_offset + 2, 2, 10)
-
-        # Draw position marker
-        self._marker_pos = rescale(self.angle, 0, 180, 50, 140 + 50) - 10
-        display.set_pen(255, 0, 0)
-        draw_char(self._marker_pos, self.vertical_offset + 13 + self.marker_offset, self.marker)
+        _rect(self._tick_min, self.vertical_offset + 2, 2, 10)
+        _rect(self._tick_max, self.vertical_offset + 2, 2, 10)
+
+        # Draw position marker (position calculated in update())
+        _set_pen(255, 0, 0)
+        draw_char(self._marker_pos, marker_y, self.marker)
+        self._drawn_marker_pos = self._marker_pos
         # Update physical servo position, correcting for angle range
         # self._servo.value((self.angle + 90) % 180)
         # self._servo.value(rescale(self.angle, -90, 90, 0, 180))
@@ -155,145 +223,222 @@ class ServoController:
         # self._servo.value(self.angle - 90)
 
     def min_position_setting_toggle(self):
+        self._dirty = True
+        self._background_dirty = True
         self.min_position_being_updated = not self.min_position_being_updated
         # Deselect the other thing if appropriate
         if self.min_position_being_updated:
             self.max_position_being_updated = False
 
     def max_position_setting_toggle(self):
+        self._dirty = True
+        self._background_dirty = True
         self.max_position_being_updated = not self.max_position_being_updated
         # Deselect the other thing if appropriate
         if self.max_position_being_updated:
             self.min_position_being_updated = False
 
+    def _update_ticks(self):
+        """Recalculate the scale positions of the movement end tic marks.
+
+        Only needs doing when min or max change, rather than on every draw."""
+        self._tick_min = _RESCALE_LUT[self.min_angle]
+        self._tick_max = _RESCALE_LUT[self.max_angle]
+
+    def _update_labels(self):
+        """Rebuild the MIN/MAX label strings.
+
+        Only needs doing when min or max change, rather than on every draw."""
+        self._min_label = "%03d MIN" % self.min_angle
+        self._max_label = "%03d MAX" % self.max_angle
+
+    @micropython.native
     def increment_value(self):
         """Increment whatever we're incrementing.
 
         Keep it within bounds.
         """
         # print(">>> Incrementing")
+        if not (self.min_position_being_updated or self.max_position_being_updated):
+            return
+        old_min = self.min_angle
+        old_max = self.max_angle
         if self.min_position_being_updated:
-            self.min_angle += 1
-        if self.min_angle > 180:
-            self.min_angle = 180
+            self.min_angle = _min(180, self.min_angle + 1)
+            # if we're moving min and it's > max, increment max also
+            if self.min_angle > self.max_angle:
+                self.max_angle = self.min_angle
 
         if self.max_position_being_updated:
-            self.max_angle += 1
-        if self.max_angle > 180:
-            self.max_angle = 180
+            self.max_angle = _min(180, self.max_angle + 1)
 
-        # if we're moving min and it's > max, increment max also
-        if self.min_angle > self.max_angle:
-            self.max_angle = self.min_angle
+        # Only redraw if something actually moved (not already at a limit)
+        if self.min_angle == old_min and self.max_angle == old_max:
+            return
+        self._dirty = True
+        self._background_dirty = True
+        self._update_ticks()
+        self._update_labels()
 
         # print(f"[{self.min_angle}, {self.max_angle}]")
 
+    @micropython.native
     def decrement_value(self):
         """Decrement whatever we're decrementing.
 
         Keep it within bounds.
         """
+        if not (self.min_position_being_updated or self.max_position_being_updated):
+            return
+        old_min = self.min_angle
+        old_max = self.max_angle
         if self.min_position_being_updated:
-            self.min_angle -= 1
-        if self.min_angle < 0:
-            self.min_angle = 0
+            self.min_angle = _max(0, self.min_angle - 1)
 
         if self.max_position_being_updated:
-            self.max_angle -= 1
-        if self.max_angle < 0:
-            self.max_angle = 0
-
-        if self.max_angle < self.min_angle:
-            self.min_angle = self.max_angle
-
-
+            self.max_angle = _max(0, self.max_angle - 1)
+            # if we're moving max and it's < min, decrement min also
+            if self.max_angle < self.min_angle:
+                self.min_angle = self.max_angle
+
+        # Only redraw if something actually moved (not already at a limit)
+        if self.min_angle == old_min and self.max_angle == old_max:
+            return
+        self._dirty = True
+        self._background_dirty = True
+        self._update_ticks()
+        self._update_labels()
+
+    @micropython.native
     def update(self):
         """Update the servo position."""
 
         # Calculate angular movement since last update
-        self._time_delta = utime.ticks_diff(utime.ticks_ms(), self._time_ref)
-        self._time_ref = utime.ticks_ms()
-        self._angle_delta = self.speed * self._time_delta / 1000
+        # Speed is in degrees/s and time in ms; keep the remainder so that
+        # slow speeds and short frames still add up to movement.
+        now = _ticks_ms()
+        self._time_delta = _ticks_diff(now, self._time_ref)
+        self._time_ref = now
+        step = self.speed * self._time_delta * 256 + self._step_remainder
+        self._angle_delta = step // 1000
+        self._step_remainder = step % 1000
 
         # Update angular position, catching end points
         if self._reversing:
-            self.angle -= self._angle_delta
-            if self.angle < self.min_angle:
-                self.angle = self.min_angle
+            self._angle_q8 -= self._angle_delta
+            if self._angle_q8 < self.min_angle * 256:
+                self._angle_q8 = self.min_angle * 256
                 self._reversing = False
         else:
-            self.angle += self._angle_delta
-            if self.angle > self.max_angle:
-                self.angle = self.max_angle
+            self._angle_q8 += self._angle_delta
+            if self._angle_q8 > self.max_angle * 256:
+                self._angle_q8 = self.max_angle * 256
                 self._reversing = True
+        self.angle = self._angle_q8 >> 8
+
+        # Only worth redrawing once the marker has moved by a pixel
+        marker_pos = _RESCALE_LUT[self.angle] - 10
+        if marker_pos != self._marker_pos:
+            self._marker_pos = marker_pos
+            self._dirty = True
 
 
 class ButtonController:
-    """Poll buttons and dispatch events.
+    """Queue button presses from interrupts and dispatch events.
 
-    Takes a mapping dictionary of buttons, objects and method calls.
-    Polls the buttons and calls the appropriate method on the object.
-    Could instantiate a ButtonController object per menu mode.
+    Takes a mapping dictionary of buttons to (bound) methods.
+    Button pins interrupt on press, queueing the button; check() then calls
+    the appropriate method, outside interrupt context.
+    Could instantiate a ButtonController object per menu mode, but only the
+    most recently created one receives each pin's interrupts.
     """
 
     def __init__(self, mapping, debounce_interval=500):
         """Initialise the controller."""
-        self._mapping = mapping
         self.debounce_interval = debounce_interval
-        self._time_last_checked = utime.ticks_ms()
-
+        self._buttons = list(mapping)
+        self._handlers = [mapping[button] for button in self._buttons]
+        self._last_pressed = [_ticks_ms()] * len(self._buttons)
+
+        # Ring buffer of pressed button indices. The interrupt handler only
+        # advances _head and check() only advances _tail.
+        self._queue = bytearray(_BUTTON_QUEUE_SIZE)
+        self._head = 0
+        self._tail = 0
+
+        # Display buttons are numbered by GPIO pin, and short to ground when pressed
+        self._pins = []
+        for index, button in enumerate(self._buttons):
+            pin = Pin(button, Pin.IN, Pin.PULL_UP)
+            pin.irq(trigger=Pin.IRQ_FALLING, handler=lambda p, index=index: self._queue_press(index))
+            self._pins.append(pin)
+
+    def _queue_press(self, index):
+        """Interrupt handler: queue a button press, dropping it if the queue is full."""
+        head = (self._head + 1) & (_BUTTON_QUEUE_SIZE - 1)
+        if head != self._tail:
+            self._queue[self._head] = index
+            self._head = head
+
+    @micropython.native
     def check(self):
-        """Check the buttons and call the appropriate method."""
-        # Check for button presses
-        for button in self._mapping:
-            if display.is_pressed(button) and utime.ticks_diff(utime.ticks_ms(), self._time_last_checked) > self.debounce_interval:
-                self._time_last_checked = utime.ticks_ms()
-                # Have to use getattr here for dynamic method call
-                getattr(self._mapping[button]['object'], self._mapping[button]['method'])()
+        """Call the appropriate method for any queued button presses."""
+        while self._tail != self._head:
+            index = self._queue[self._tail]
+            self._tail = (self._tail + 1) & (_BUTTON_QUEUE_SIZE - 1)
+            # Ignore edges from release bounce: the button must still be held
+            if self._pins[index].value():
+                continue
+            now = _ticks_ms()
+            # Ignore switch bounce and repeat presses within the debounce interval
+            if _ticks_diff(now, self._last_pressed[index]) > self.debounce_interval:
+                self._last_pressed[index] = now
+                self._handlers[index]()
 
 
 class RotaryController():
     """Read rotary encoder value and dispatch accordingly.
 
-    Takes a mapping dictionary of servo objects and method calls.
-    Polls the encoder and calls the appropriate method on the object.
+    Takes a mapping dictionary of servo objects to (increment, decrement)
+    tuples of bound methods.
+    Polls the encoder and calls the appropriate method.
     """
 
     def __init__(self, mapping, debounce_interval=60):
         """Initialize the controller."""
-        self._mapping = mapping
+        # Flat lists of the handlers, fixed at startup, so dispatch
+        # doesn't walk the dict and index a tuple on every step
+        self._inc = [handlers[0] for handlers in mapping.values()]
+        self._dec = [handlers[1] for handlers in mapping.values()]
         self._debounce_interval = debounce_interval
-        self._time_last_checked = utime.ticks_ms()
+        self._time_last_checked = _ticks_ms()
 
         self._r = RotaryIRQ(pin_num_clk=21,
               pin_num_dt=22,
-              min_val=-5000,
-              max_val=+5000,
               reverse=False,
-              range_mode=RotaryIRQ.RANGE_WRAP, # set wrap, as range starts at min_val
+              range_mode=RotaryIRQ.RANGE_UNBOUNDED, # only the direction of change is used
               pull_up=False,
               half_step=True)
 
         self._old_value = self._r.value()
-        self._new_value = self._r.value()
 
+    @micropython.native
     def check(self):
         """Check the rotary encoder value and dispatch accordingly."""
 
-        if utime.ticks_diff(utime.ticks_ms(), self._time_last_checked) > self._debounce_interval:
-            self._time_last_checked = utime.ticks_ms()
-            self._new_value = self._r.value()
-            if self._new_value > self._old_value:
-                self._old_value = self._new_value
-                for object in self._mapping:
-                    getattr(object, self._mapping[object]['inc_method'])()
+        now = _ticks_ms()
+        if _ticks_diff(now, self._time_last_checked) > self._debounce_interval:
+            self._time_last_checked = now
+            new_value = self._r.value()
+            if new_value > self._old_value:
+                self._old_value = new_value
+                for cb in self._inc:
+                    cb()
                     # print("Incrementing")
-                    # print(object, self._mapping[object]['inc_method'])
-            if self._new_value < self._old_value:
-                self._old_value = self._new_value
-                for object in self._mapping:
-                    # Note the (): you still have to call the method once you've found it.
-                    getattr(object, self._mapping[object]['dec_method'])()
+            if new_value < self._old_value:
+                self._old_value = new_value
+                for cb in self._dec:
+                    cb()
                     # print("Decrementing")
 
 
@@ -304,7 +449,7 @@ if __name__ == '__main__':
     servoD7 = ServoController(pin=3, speed=60, vertical_offset=90, marker=down_arrow, marker_offset=-25)
 
     # For some reason, we need to draw everything once, or the methods error out in the loop. weird.
-    display.set_pen(0, 0, 0)
+    _set_pen(0, 0, 0)
     display.clear()
     servoD5.draw()
     servoD7.draw()
@@ -318,45 +463,59 @@ if __name__ == '__main__':
     # Setting up callbacks for buttons and rotary encoder.
     # This is for the main screen: later modes will pass their own sets here.
     button_mapping = {
-        display.BUTTON_A: {
-            "object": servoD5, "method": "min_position_setting_toggle" },
-        display.BUTTON_X: {
-            "object": servoD5, "method": "max_position_setting_toggle" },
-        display.BUTTON_B: {
-            "object": servoD7, "method": "min_position_setting_toggle" },
-        display.BUTTON_Y: {
-            "object": servoD7, "method": "max_position_setting_toggle" }
+        display.BUTTON_A: servoD5.min_position_setting_toggle,
+        display.BUTTON_X: servoD5.max_position_setting_toggle,
+        display.BUTTON_B: servoD7.min_position_setting_toggle,
+        display.BUTTON_Y: servoD7.max_position_setting_toggle
     }
     buttons = ButtonController(button_mapping, debounce_interval=500)
 
+    # Bound methods to call on (increment, decrement)
     rotary_mapping = {
-        servoD5: {
-            "inc_method": "increment_value",
-            "dec_method": "decrement_value"
-        },
-        servoD7: {
-            "inc_method": "increment_value",
-            "dec_method": "decrement_value"
-        }
+        servoD5: (servoD5.increment_value, servoD5.decrement_value),
+        servoD7: (servoD7.increment_value, servoD7.decrement_value)
     }
     rotary = RotaryController(rotary_mapping)
 
+    # Run each job on its own schedule (intervals in ms) and sleep in between,
+    # rather than spinning: servos at 50 Hz, inputs at 100 Hz, and redraws at
+    # ~30 Hz, since pushing the framebuffer over SPI is slow and faster isn't visible.
+    update_interval = 20
+    poll_interval = 10
+    frame_interval = 33
+    next_update = next_poll = next_frame = _ticks_ms()
 
     while True:
-        display.set_pen(0, 0, 0)
-        display.clear()
-        servoD5.draw()
-        servoD7.draw()
-        display.update()
-
-        servoD5.update()
-        servoD7.update()
-
-        servoD5.move()
-        servoD7.move()
-
-        buttons.check()
-        rotary.check()
-
-        # utime.sleep_ms(20)
-
+        now = _ticks_ms()
+
+        if _ticks_diff(now, next_poll) >= 0:
+            next_poll = _ticks_add(now, poll_interval)
+            buttons.check()
+            rotary.check()
+
+        if _ticks_diff(now, next_update) >= 0:
+            next_update = _ticks_add(now, update_interval)
+            servoD5.update()
+            servoD7.update()
+
+            servoD5.move()
+            servoD7.move()
+
+        # Only redraw (and push the framebuffer to the display) when something has changed.
+        # Each servo erases its own strip, so there's no need to clear the whole screen.
+        if _ticks_diff(now, next_frame) >= 0:
+            next_frame = _ticks_add(now, frame_interval)
+            if servoD5._dirty or servoD7._dirty:
+                if servoD5._dirty:
+                    servoD5.draw()
+                    servoD5._dirty = False
+                if servoD7._dirty:
+                    servoD7.draw()
+                    servoD7._dirty = False
+                display.update()
+
+        # Sleep until the next job is due
+        now = _ticks_ms()
+        utime.sleep_ms(_max(0, _min(_ticks_diff(next_poll, now),
+                                    _ticks_diff(next_update, now),
+                                    _ticks_diff(next_frame, now))))